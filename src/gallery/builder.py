@@ -0,0 +1,246 @@
+import hashlib
+import html
+import io
+import json
+import logging
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import quote
+
+from rich.console import Console
+from rich.text import Text
+
+from ..preview.engine import PreviewEngine
+from ..sandbox.manager import SandboxManager
+from ..themes.discovery import ThemeDiscovery
+
+logger = logging.getLogger(__name__)
+
+INDEX_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Oh-My-Zsh Theme Gallery</title>
+<style>
+body {{ background: #1e1e1e; color: #ddd; font-family: sans-serif; margin: 2em; }}
+.theme {{ margin-bottom: 2em; }}
+.theme h2 {{ font-size: 1em; margin: 0 0 0.5em 0; }}
+.theme a {{ color: #8ab4f8; }}
+.theme img {{ max-width: 100%; }}
+</style>
+</head>
+<body>
+<h1>Oh-My-Zsh Theme Gallery</h1>
+<p>{count} themes &middot; oh-my-zsh revision <code>{revision}</code></p>
+{entries}
+</body>
+</html>
+"""
+
+ENTRY_TEMPLATE = """<div class="theme">
+<h2><a href="themes/{href}.html">{name}</a></h2>
+<img src="themes/{href}.svg" alt="{name}">
+</div>"""
+
+
+class GalleryBuilder:
+    """
+    Builds a static HTML/SVG gallery of every theme's rendered prompt.
+
+    Builds are incremental: a manifest records the theme file hash and the
+    oh-my-zsh revision each theme was rendered against, and only themes whose
+    entry changed (or whose output files are missing) are rendered again.
+    """
+
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(self, discovery: ThemeDiscovery, output_dir: str = "gallery",
+                 workers: int = 4, sandbox_root: str = "/tmp/omz-gallery", width: int = 100):
+        self.discovery = discovery
+        self.output_dir = Path(output_dir)
+        self.themes_dir = self.output_dir / "themes"
+        self.manifest_path = self.output_dir / self.MANIFEST_NAME
+        self.workers = max(1, workers)
+        self.sandbox_root = Path(sandbox_root)
+        self.width = width
+        self._local = threading.local()
+        self._sandboxes = []
+        self._sandboxes_lock = threading.Lock()
+
+    def build(self, themes=None, force: bool = False) -> dict:
+        """
+        Renders every theme that is new or changed since the last build and
+        regenerates the index page.
+        Returns a dict with the 'rendered', 'skipped' and 'failed' theme names.
+        """
+        full_build = themes is None
+        if full_build:
+            themes = self.discovery.scan_themes()
+
+        self.themes_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._load_manifest()
+        revision = self.get_omz_revision()
+
+        result = {"rendered": [], "skipped": [], "failed": []}
+        try:
+            # Lookup (possibly a download), hashing and rendering all run in the pool
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = {
+                    pool.submit(self._build_theme, name, manifest.get(name), revision, force): name
+                    for name in themes
+                }
+                for future in as_completed(futures):
+                    theme_name = futures[future]
+                    try:
+                        status, entry = future.result()
+                    except Exception as e:
+                        # Keep the previous render: its stale entry makes the next build retry
+                        logger.error(f"Error rendering {theme_name} for gallery: {e}")
+                        result["failed"].append(theme_name)
+                        continue
+
+                    if status == "missing":
+                        manifest.pop(theme_name, None)
+                        self._remove_output(theme_name)
+                        result["failed"].append(theme_name)
+                    else:
+                        manifest[theme_name] = entry
+                        result[status].append(theme_name)
+        finally:
+            self._cleanup_sandboxes()
+
+        # Drop themes that no longer exist so the index matches the current set
+        if full_build:
+            current = set(themes)
+            for theme_name in list(manifest):
+                if theme_name not in current:
+                    del manifest[theme_name]
+                    self._remove_output(theme_name)
+
+        self._save_manifest(manifest)
+        self._write_index(manifest, revision)
+        return result
+
+    def get_omz_revision(self) -> str:
+        """Returns the git revision of the local oh-my-zsh checkout, or '' if unknown."""
+        try:
+            proc = subprocess.run(
+                ["git", "-C", str(self.discovery.omz_path), "rev-parse", "HEAD"],
+                capture_output=True, text=True, timeout=5,
+            )
+            if proc.returncode == 0:
+                return proc.stdout.strip()
+        except Exception as e:
+            logger.error(f"Failed to read oh-my-zsh revision: {e}")
+        return ""
+
+    def _build_theme(self, theme_name, previous, revision, force):
+        """
+        Worker: hashes the theme and renders it unless the manifest entry is current.
+        Returns a (status, manifest entry) tuple.
+        """
+        theme_path = self.discovery.get_theme_path(theme_name)
+        if theme_path is None:
+            logger.error(f"Theme {theme_name} not found, dropping it from the gallery")
+            return "missing", None
+
+        entry = {"hash": self._hash_file(theme_path), "omz_revision": revision}
+        if not force and self._is_up_to_date(theme_name, entry, previous):
+            return "skipped", entry
+
+        self._render_theme(theme_name)
+        return "rendered", entry
+
+    def _is_up_to_date(self, theme_name, entry, previous) -> bool:
+        if previous != entry:
+            return False
+        stem = self._file_stem(theme_name)
+        return (self.themes_dir / f"{stem}.svg").exists() and (self.themes_dir / f"{stem}.html").exists()
+
+    def _render_theme(self, theme_name):
+        """Renders one theme in this worker thread's sandbox and exports it."""
+        output = self._get_engine().generate_preview(theme_name)
+        if output.startswith("Error:"):
+            raise RuntimeError(output)
+
+        console = Console(record=True, file=io.StringIO(), width=self.width,
+                          force_terminal=True, color_system="truecolor")
+        console.print(Text.from_ansi(output))
+
+        stem = self._file_stem(theme_name)
+        (self.themes_dir / f"{stem}.svg").write_text(console.export_svg(title=theme_name, clear=False))
+        (self.themes_dir / f"{stem}.html").write_text(console.export_html(inline_styles=True))
+
+    def _remove_output(self, theme_name):
+        stem = self._file_stem(theme_name)
+        for suffix in (".svg", ".html"):
+            (self.themes_dir / f"{stem}{suffix}").unlink(missing_ok=True)
+
+    def _get_engine(self) -> PreviewEngine:
+        """Each worker thread gets its own sandbox so .zshrc files don't clash."""
+        engine = getattr(self._local, "engine", None)
+        if engine is None:
+            with self._sandboxes_lock:
+                sandbox = SandboxManager(str(self.sandbox_root / f"worker-{len(self._sandboxes)}"))
+                self._sandboxes.append(sandbox)
+            sandbox.setup()
+            engine = PreviewEngine(sandbox, self.discovery)
+            self._local.engine = engine
+        return engine
+
+    def _cleanup_sandboxes(self):
+        for sandbox in self._sandboxes:
+            sandbox.cleanup()
+        self._sandboxes = []
+        self._local = threading.local()
+        if self.sandbox_root.exists():
+            shutil.rmtree(self.sandbox_root, ignore_errors=True)
+
+    def _load_manifest(self) -> dict:
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            return json.loads(self.manifest_path.read_text()).get("themes", {})
+        except Exception as e:
+            logger.error(f"Ignoring unreadable gallery manifest: {e}")
+            return {}
+
+    def _save_manifest(self, manifest):
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"themes": manifest}, indent=2, sort_keys=True))
+        tmp_path.replace(self.manifest_path)
+
+    def _write_index(self, manifest, revision):
+        entries = "\n".join(
+            ENTRY_TEMPLATE.format(href=quote(self._file_stem(name)), name=html.escape(name))
+            for name in sorted(manifest)
+        )
+        content = INDEX_TEMPLATE.format(count=len(manifest), revision=html.escape(revision or "unknown"), entries=entries)
+        (self.output_dir / "index.html").write_text(content)
+
+    @staticmethod
+    def _file_stem(theme_name: str) -> str:
+        return theme_name.replace("/", "_")
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build a static HTML/SVG gallery of Oh-My-Zsh themes.")
+    parser.add_argument("--output", default="gallery", help="Output directory (default: gallery)")
+    parser.add_argument("--workers", type=int, default=4, help="Number of parallel renders (default: 4)")
+    parser.add_argument("--force", action="store_true", help="Re-render every theme, ignoring the manifest")
+    parser.add_argument("themes", nargs="*", help="Only build these themes (default: all)")
+    args = parser.parse_args()
+
+    builder = GalleryBuilder(ThemeDiscovery(), output_dir=args.output, workers=args.workers)
+    summary = builder.build(themes=args.themes or None, force=args.force)
+    print(f"Rendered {len(summary['rendered'])}, skipped {len(summary['skipped'])}, failed {len(summary['failed'])}")
+    print(f"Gallery written to {builder.output_dir / 'index.html'}")
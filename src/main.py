@@ -8,9 +8,11 @@ from rich.ansi import AnsiDecoder
 from .themes.discovery import ThemeDiscovery
 from .sandbox.manager import SandboxManager
 from .preview.engine import PreviewEngine
+from .preview.async_engine import AsyncPreviewEngine
 from .apply.engine import ApplyEngine
 import logging
 import asyncio
+import os
 
 # Configure basic logging
 logging.basicConfig(level=logging.ERROR, filename="tui_errors.log")
@@ -21,6 +23,10 @@ class ThemeItem(ListItem):
         super().__init__(Label(label))
         self.theme_name = theme_name
 
+    def set_pinned(self, pinned: bool):
+        """Marks the item as pinned for comparison."""
+        self.query_one(Label).update(f"* {self.theme_name}" if pinned else self.theme_name)
+
 class ThemePreviewApp(App):
     """ZSH Theme Preview TUI."""
 
@@ -48,7 +54,23 @@ class ThemePreviewApp(App):
     }
     
     #preview_output {
-        height: 100%;
+        height: 1fr;
+    }
+
+    /* Compare mode: pinned themes side by side below the live preview */
+    #compare_pane {
+        height: 1fr;
+        display: none;
+        border-top: solid $primary;
+    }
+
+    #compare_pane.visible {
+        display: block;
+    }
+
+    .compare_column {
+        width: 1fr;
+        padding: 0 1;
     }
 
     /* Ranger-style List Items */
@@ -99,8 +121,15 @@ class ThemePreviewApp(App):
         Binding("j", "cursor_down", "Down", show=False),
         Binding("k", "cursor_up", "Up", show=False),
         Binding("enter", "select_theme", "Apply", show=True),
+        Binding("p", "toggle_pin", "Pin"),
+        Binding("c", "toggle_compare", "Compare"),
     ]
 
+    # Compare mode limits: how many themes can be pinned, and how many of
+    # them may render at the same time (each worker has its own sandbox).
+    MAX_PINNED = 3
+    COMPARE_WORKERS = 2
+
     def action_cursor_down(self):
         self.query_one("#theme_list", ListView).action_cursor_down()
 
@@ -123,6 +152,82 @@ class ThemePreviewApp(App):
             if isinstance(item, ThemeItem):
                 self.apply_theme(item.theme_name)
 
+    async def action_toggle_pin(self):
+        """Pins/unpins the highlighted theme for side-by-side comparison."""
+        list_view = self.query_one("#theme_list", ListView)
+        item = list_view.highlighted_child
+        if not isinstance(item, ThemeItem):
+            return
+
+        theme_name = item.theme_name
+        if theme_name in self.pinned:
+            self.pinned.remove(theme_name)
+            self.compare_cache.pop(theme_name, None)
+            item.set_pinned(False)
+        else:
+            if len(self.pinned) >= self.MAX_PINNED:
+                self.notify(f"You can pin up to {self.MAX_PINNED} themes.", severity="warning", timeout=3)
+                return
+            self.pinned.append(theme_name)
+            item.set_pinned(True)
+            self.compare_visible = True
+            self.run_worker(self._render_pinned_task(theme_name), group="compare", exclusive=False)
+
+        await self._rebuild_compare_pane()
+
+    def action_toggle_compare(self):
+        """Shows/hides the compare pane without touching the pinned themes."""
+        self.compare_visible = not self.compare_visible
+        self._update_compare_visibility()
+
+    async def _render_pinned_task(self, theme_name):
+        """Renders a pinned theme once, using one of the compare engines."""
+        engine = await self.compare_engines.get()
+        try:
+            output = await self._render(engine, theme_name)
+            rendered = Text.from_ansi(output)
+        except Exception as e:
+            rendered = Text(f"Error: {e}", style="bold red")
+        finally:
+            self.compare_engines.put_nowait(engine)
+
+        # The theme may have been unpinned while it was rendering
+        if theme_name in self.pinned:
+            self.compare_cache[theme_name] = rendered
+            column = self.compare_columns.get(theme_name)
+            if column is not None:
+                column.update(rendered)
+
+    async def _render(self, engine, theme_name) -> str:
+        """Runs a preview on either backend without blocking the UI."""
+        if isinstance(engine, AsyncPreviewEngine):
+            return await engine.generate_preview(theme_name)
+        # Run the blocking generation in a thread
+        return await asyncio.to_thread(engine.generate_preview, theme_name)
+
+    def _update_compare_visibility(self):
+        pane = self.query_one("#compare_pane", Horizontal)
+        pane.set_class(self.compare_visible and bool(self.pinned), "visible")
+
+    async def _rebuild_compare_pane(self):
+        """Rebuilds the compare columns after a theme is pinned or unpinned."""
+        pane = self.query_one("#compare_pane", Horizontal)
+        self._update_compare_visibility()
+        await pane.remove_children()
+
+        # Renders that finish later update their column's Static in place
+        self.compare_columns = {}
+        columns = []
+        for theme_name in self.pinned:
+            rendered = self.compare_cache.get(theme_name, Text("Generating preview...", style="dim"))
+            self.compare_columns[theme_name] = Static(rendered)
+            columns.append(Vertical(
+                Label(theme_name, classes="header"),
+                self.compare_columns[theme_name],
+                classes="compare_column",
+            ))
+        await pane.mount_all(columns)
+
     def apply_theme(self, theme_name):
         self.notify(f"Applying theme: {theme_name}...", title="Working", timeout=2)
         # Run in thread to not block UI during file ops/network
@@ -135,15 +240,29 @@ class ThemePreviewApp(App):
         except Exception as e:
             self.notify(f"Error: {e}", title="Error", severity="error", timeout=10)
 
-    def __init__(self):
+    def __init__(self, preview_backend: str = None):
         super().__init__()
+        # "pexpect" (default) renders in a thread per preview,
+        # "pty" uses the asyncio-native engine on the app's event loop.
+        self.preview_backend = preview_backend or os.environ.get("OMZ_PREVIEW_BACKEND", "pexpect")
+        self.engine_class = AsyncPreviewEngine if self.preview_backend == "pty" else PreviewEngine
         self.sandbox = SandboxManager()
         self.discovery = ThemeDiscovery()
-        self.preview_engine = PreviewEngine(self.sandbox, self.discovery)
+        self.preview_engine = self.engine_class(self.sandbox, self.discovery)
         self.apply_engine = ApplyEngine(self.discovery)
         self.themes = []
         self.decoder = AnsiDecoder()
 
+        # Compare mode state
+        self.pinned = []
+        self.compare_cache = {}
+        self.compare_columns = {}
+        self.compare_visible = False
+        self.compare_sandboxes = [
+            SandboxManager(f"/tmp/omz-preview-compare-{i}") for i in range(self.COMPARE_WORKERS)
+        ]
+        self.compare_engines = asyncio.Queue()
+
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
         yield Header()
@@ -156,12 +275,17 @@ class ThemePreviewApp(App):
             with Container(id="preview_container"):
                 yield Label("Preview", classes="header")
                 yield Static(id="preview_output", expand=True)
+                yield Horizontal(id="compare_pane")
                 
         yield Footer()
 
     def on_mount(self):
         """Event when the app loads."""
         self.sandbox.setup()
+        for sandbox in self.compare_sandboxes:
+            sandbox.setup()
+            self.compare_engines.put_nowait(self.engine_class(sandbox, self.discovery))
+
         self.themes = self.discovery.scan_themes()
         
         list_view = self.query_one("#theme_list", ListView)
@@ -192,8 +316,7 @@ class ThemePreviewApp(App):
     async def _generate_preview_task(self, theme_name, preview_pane):
         """Worker task to generate preview off-thread."""
         try:
-            # Run the blocking generation in a thread
-            output = await asyncio.to_thread(self.preview_engine.generate_preview, theme_name)
+            output = await self._render(self.preview_engine, theme_name)
             
             # Decode ANSI
             rich_text = Text.from_ansi(output)
@@ -207,6 +330,8 @@ class ThemePreviewApp(App):
     def on_unmount(self):
         """Cleanup when app exits."""
         self.sandbox.cleanup()
+        for sandbox in self.compare_sandboxes:
+            sandbox.cleanup()
 
 if __name__ == "__main__":
     app = ThemePreviewApp()
@@ -0,0 +1,196 @@
+import asyncio
+import fcntl
+import os
+import pty
+import shutil
+import signal
+import struct
+import tempfile
+import termios
+import logging
+from pathlib import Path
+from ..sandbox.manager import SandboxManager
+from ..themes.discovery import ThemeDiscovery
+
+logger = logging.getLogger(__name__)
+
+class AsyncPreviewEngine:
+    """
+    Asyncio-native alternative to PreviewEngine.
+
+    Forks ZSH on a PTY with pty.fork() and registers the non-blocking master
+    fd (and, on Linux, a pidfd for reaping) on the running event loop, so each
+    preview session costs file descriptors instead of threads. Timeouts and
+    cancellation are plain asyncio: cancelling the awaiting task kills the
+    session.
+    """
+
+    LOADED_MARKER = b"DEBUG_OMZ_LOADED"
+    END_MARKER = b"__MARKER__"
+
+    def __init__(self, sandbox_manager: SandboxManager, discovery: ThemeDiscovery = None,
+                 timeout: float = 3, rows: int = 24, cols: int = 80):
+        self.sandbox = sandbox_manager
+        self.discovery = discovery
+        self.timeout = timeout
+        self.rows = rows
+        self.cols = cols
+
+    async def generate_preview(self, theme_name: str) -> str:
+        """
+        Generates a preview for the given theme.
+        Returns the raw ANSI string captured from the terminal.
+        """
+        # Each session gets its own ZDOTDIR so concurrent previews don't
+        # overwrite each other's .zshrc.
+        session_dir = Path(tempfile.mkdtemp(prefix="session-", dir=self.sandbox.base_path))
+        try:
+            theme_path = None
+            if self.discovery:
+                theme_path = self.discovery.find_local_theme(theme_name)
+                if theme_path is None:
+                    # Only a download needs to leave the loop
+                    theme_path = await asyncio.to_thread(self.discovery.get_theme_path, theme_name)
+            self.sandbox.create_zshrc(theme_name, theme_path=theme_path, zdotdir=session_dir)
+
+            env = os.environ.copy()
+            env["ZDOTDIR"] = str(session_dir)
+            env["TERM"] = "xterm-256color"
+
+            return await self._run_session(env)
+
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out generating preview for {theme_name}")
+            return f"Error: timed out after {self.timeout}s waiting for the prompt"
+        except Exception as e:
+            logger.error(f"Error generating preview for {theme_name}: {e}")
+            return f"Error: {e}"
+        finally:
+            shutil.rmtree(session_dir, ignore_errors=True)
+
+    async def _run_session(self, env) -> str:
+        """Runs one interactive zsh on a fresh PTY and captures the first prompt."""
+        loop = asyncio.get_running_loop()
+        pid, master = pty.fork()
+        if pid == 0:
+            # Child: pty.fork() already made the PTY our controlling terminal
+            try:
+                os.execvpe("zsh", ["zsh", "-i"], env)
+            finally:
+                os._exit(127)
+
+        # pty.fork() leaves the master inheritable; without this every later
+        # session's zsh would hold it open. Forks only happen on the loop
+        # thread, so nothing can fork between pty.fork() and this call.
+        os.set_inheritable(master, False)
+
+        try:
+            try:
+                fcntl.ioctl(master, termios.TIOCSWINSZ, struct.pack("HHHH", self.rows, self.cols, 0, 0))
+                session = _PtyReader(loop, master)
+                try:
+                    # Wait for OMZ to finish loading, then type a marker command:
+                    # the prompt is everything between the two markers.
+                    _, loaded_end = await session.expect(self.LOADED_MARKER, 0, self.timeout)
+                    await asyncio.sleep(0.1)  # Wait for prompt to render
+                    os.write(master, b"echo " + self.END_MARKER + b"\n")
+                    marker_start, _ = await session.expect(self.END_MARKER, loaded_end, self.timeout)
+                    raw = session.buffer[loaded_end:marker_start].decode("utf-8", errors="replace")
+                finally:
+                    session.close()
+            finally:
+                os.close(master)
+
+            # Remove the last occurrence of 'echo ' (the command we typed)
+            if "echo " in raw:
+                raw = raw.rsplit("echo ", 1)[0]
+
+            return raw.strip()
+
+        finally:
+            try:
+                # pty.fork() calls setsid(), so zsh leads its own process group:
+                # kill it together with async prompt helpers (git status etc.)
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await asyncio.shield(_reap(loop, pid))
+
+
+async def _reap(loop: asyncio.AbstractEventLoop, pid: int):
+    """Waits for `pid` to exit and reaps it without a child-watcher thread."""
+    try:
+        pidfd = os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        # No pidfd support (macOS, old kernels): poll instead
+        try:
+            while os.waitpid(pid, os.WNOHANG) == (0, 0):
+                await asyncio.sleep(0.05)
+        except ChildProcessError:
+            pass
+        return
+
+    exited = loop.create_future()
+    try:
+        loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+        try:
+            await exited
+        finally:
+            loop.remove_reader(pidfd)
+        os.waitpid(pid, 0)
+    finally:
+        os.close(pidfd)
+
+
+class _PtyReader:
+    """Collects output from a non-blocking PTY master fd via loop.add_reader()."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, fd: int):
+        self.loop = loop
+        self.fd = fd
+        self.buffer = bytearray()
+        self.eof = False
+        self._changed = asyncio.Event()
+        os.set_blocking(fd, False)
+        loop.add_reader(fd, self._on_readable)
+
+    def _on_readable(self):
+        try:
+            data = os.read(self.fd, 4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            # Linux raises EIO on the master once the child side is closed
+            data = b""
+
+        if data:
+            self.buffer.extend(data)
+        else:
+            self.eof = True
+            self.loop.remove_reader(self.fd)
+        self._changed.set()
+
+    async def expect(self, pattern: bytes, start: int, timeout: float):
+        """
+        Waits until `pattern` appears in the buffer at or after `start`.
+        Returns the (start, end) offsets of the match.
+        Raises asyncio.TimeoutError or EOFError if it never shows up.
+        """
+        async def _wait():
+            while True:
+                index = self.buffer.find(pattern, start)
+                if index != -1:
+                    return index, index + len(pattern)
+                if self.eof:
+                    raise EOFError(f"zsh exited before printing {pattern.decode()}")
+                self._changed.clear()
+                await self._changed.wait()
+
+        return await asyncio.wait_for(_wait(), timeout)
+
+    def close(self):
+        if not self.eof:
+            self.loop.remove_reader(self.fd)
+            self.eof = True
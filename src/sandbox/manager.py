@@ -1,5 +1,6 @@
 import os
 import shutil
+import filecmp
 import tempfile
 import logging
 from pathlib import Path
@@ -13,7 +14,10 @@ class SandboxManager:
         self.base_path = Path(base_path)
         self.zshrc_path = self.base_path / ".zshrc"
         self.omz_path = self.base_path / "oh-my-zsh"
-        self.custom_themes_path = self.omz_path / "custom/themes"
+        # Sandbox-private ZSH_CUSTOM: omz_path may be a symlink to the user's
+        # real OMZ, so theme copies must never go to <omz>/custom.
+        self.custom_path = self.base_path / "custom"
+        self.custom_themes_path = self.custom_path / "themes"
 
     def setup(self):
         """Creates the sandbox directory structure and mocks necessary files."""
@@ -39,18 +43,23 @@ class SandboxManager:
              # For MVP assuming local OMZ exists as per context found earlier
              logger.warning("Local .oh-my-zsh not found. Preview might fail if it depends on lib files.")
 
-    def create_zshrc(self, theme_name: str, theme_path: Path = None):
-        """Generates a temporary .zshrc that loads the specified theme."""
+    def create_zshrc(self, theme_name: str, theme_path: Path = None, zdotdir: Path = None):
+        """
+        Generates a temporary .zshrc that loads the specified theme.
+        By default it is written to the sandbox root; pass `zdotdir` to write it
+        somewhere else (e.g. a per-session directory for concurrent previews).
+        """
         
         # Ensure custom themes dir exists in sandbox
-        sandbox_custom_themes = self.omz_path / "custom/themes"
+        sandbox_custom_themes = self.custom_themes_path
         sandbox_custom_themes.mkdir(parents=True, exist_ok=True)
 
         if theme_path and theme_path.exists():
             # If the theme is external/cached, we need to make it available to the sandbox.
-            # We can copy it to sandbox/oh-my-zsh/custom/themes/
+            # We can copy it to sandbox/custom/themes/
+            # OMZ loads custom themes first, so the copy must always match the source.
             dest = sandbox_custom_themes / f"{theme_name}.zsh-theme"
-            if not dest.exists(): # overwrite if needed or symlink? Copy is safer.
+            if not dest.exists() or not filecmp.cmp(theme_path, dest, shallow=False):
                 shutil.copy(theme_path, dest)
         
         # Standard OMZ loading logic
@@ -58,6 +67,7 @@ class SandboxManager:
 # Sandbox .zshrc
 export ZSH="{self.omz_path}"
 export ZSH_THEME="{theme_name}"
+export ZSH_CUSTOM="{self.custom_path}"
 
 # Disable auto-update
 zstyle ':omz:update' mode disabled
@@ -70,7 +80,8 @@ unsetopt PROMPT_SP
 
 echo "DEBUG_OMZ_LOADED"
 """
-        with open(self.zshrc_path, "w") as f:
+        zshrc_path = Path(zdotdir) / ".zshrc" if zdotdir else self.zshrc_path
+        with open(zshrc_path, "w") as f:
             f.write(content)
             
     def cleanup(self):
@@ -84,22 +84,34 @@ class ThemeDiscovery:
         Returns the path to the theme file. 
         Downloads it if it's a remote theme and not found locally.
         """
-        # 1. Check local installed
-        std_path = self.omz_path / "themes" / f"{theme_name}.zsh-theme"
-        if std_path.exists():
-            return std_path
-            
+        local_path = self.find_local_theme(theme_name)
+        if local_path:
+            return local_path
+
+        # 3. Download
+        cached_path = self.cache_dir / f"{theme_name}.zsh-theme"
+        return self._download_theme(theme_name, cached_path)
+
+    def find_local_theme(self, theme_name: str):
+        """
+        Returns the path to an installed or cached theme file, or None.
+        Never touches the network.
+        """
+        # 1. Check local installed (custom first, matching OMZ's load order)
         custom_path = self.omz_path / "custom/themes" / f"{theme_name}.zsh-theme"
         if custom_path.exists():
             return custom_path
+
+        std_path = self.omz_path / "themes" / f"{theme_name}.zsh-theme"
+        if std_path.exists():
+            return std_path
             
         # 2. Check cache
         cached_path = self.cache_dir / f"{theme_name}.zsh-theme"
         if cached_path.exists():
             return cached_path
-            
-        # 3. Download
-        return self._download_theme(theme_name, cached_path)
+
+        return None
 
     def _download_theme(self, theme_name, dest_path):
         url = self.RAW_THEME_URL.format(theme=theme_name)
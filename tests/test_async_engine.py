@@ -0,0 +1,125 @@
+import asyncio
+import os
+import threading
+import pytest
+from src.preview.async_engine import AsyncPreviewEngine
+from src.sandbox.manager import SandboxManager
+
+# Stand-in for zsh: behaviour is picked with $STUB_MODE so no oh-my-zsh is needed.
+STUB_ZSH = """#!/bin/bash
+case "$STUB_MODE" in
+  hang) sleep 30 ;;
+  exit) echo DEBUG_OMZ_LOADED; exit 0 ;;
+  background) sleep 30 & echo "$$ $!" > "$STUB_PIDS"; sleep 30 ;;
+  fds) sleep 0.3; ls -l /proc/$$/fd | grep -c ptmx > "$STUB_FDS/$$" ;;
+esac
+echo DEBUG_OMZ_LOADED
+printf '\\033[32muser@host\\033[0m ~ %% '
+read line
+echo "${line#echo }"
+sleep 30
+"""
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    stub = bin_dir / "zsh"
+    stub.write_text(STUB_ZSH)
+    stub.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    sandbox = SandboxManager(str(tmp_path / "sandbox"))
+    sandbox.setup()
+    return AsyncPreviewEngine(sandbox, timeout=2)
+
+
+def open_fds():
+    return len(os.listdir("/proc/self/fd"))
+
+
+def is_alive(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            state = f.read().rsplit(")", 1)[1].split()[0]
+    except FileNotFoundError:
+        return False
+    return state not in ("Z", "X")
+
+
+def test_captures_prompt(engine):
+    output = asyncio.run(engine.generate_preview("demo"))
+    assert output == "\x1b[32muser@host\x1b[0m ~ %"
+    # The per-session ZDOTDIR is removed afterwards
+    assert not list(engine.sandbox.base_path.glob("session-*"))
+
+
+def test_concurrent_sessions_use_no_threads(engine):
+    async def run():
+        peak = threading.active_count()
+        tasks = [asyncio.create_task(engine.generate_preview(f"t{i}")) for i in range(20)]
+        while not all(t.done() for t in tasks):
+            peak = max(peak, threading.active_count())
+            await asyncio.sleep(0.01)
+        return peak, [t.result() for t in tasks]
+
+    baseline = threading.active_count()
+    peak, outputs = asyncio.run(run())
+    assert peak == baseline
+    assert set(outputs) == {"\x1b[32muser@host\x1b[0m ~ %"}
+
+
+def test_children_do_not_inherit_other_sessions_masters(engine, tmp_path, monkeypatch):
+    fds_dir = tmp_path / "fds"
+    fds_dir.mkdir()
+    monkeypatch.setenv("STUB_MODE", "fds")
+    monkeypatch.setenv("STUB_FDS", str(fds_dir))
+
+    async def run():
+        return await asyncio.gather(*[engine.generate_preview(f"t{i}") for i in range(5)])
+
+    outputs = asyncio.run(run())
+    assert not any(o.startswith("Error") for o in outputs)
+    counts = [int(f.read_text()) for f in fds_dir.iterdir()]
+    assert len(counts) == 5
+    assert counts == [0] * 5
+
+
+def test_timeout_returns_error(engine, monkeypatch):
+    monkeypatch.setenv("STUB_MODE", "hang")
+    engine.timeout = 0.3
+    output = asyncio.run(engine.generate_preview("demo"))
+    assert output.startswith("Error: timed out")
+
+
+def test_eof_before_marker_returns_error(engine, monkeypatch):
+    monkeypatch.setenv("STUB_MODE", "exit")
+    output = asyncio.run(engine.generate_preview("demo"))
+    assert output.startswith("Error: zsh exited before printing __MARKER__")
+
+
+def test_cancel_kills_process_group_without_leaking_fds(engine, tmp_path, monkeypatch):
+    pids_file = tmp_path / "pids"
+    monkeypatch.setenv("STUB_MODE", "background")
+    monkeypatch.setenv("STUB_PIDS", str(pids_file))
+
+    async def run():
+        before = open_fds()
+        task = asyncio.create_task(engine.generate_preview("demo"))
+        for _ in range(200):
+            if pids_file.exists() and pids_file.read_text().strip():
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # Let the shielded reap finish
+        await asyncio.sleep(0.2)
+        return before, open_fds()
+
+    before, after = asyncio.run(run())
+    assert after == before
+    shell_pid, background_pid = map(int, pids_file.read_text().split())
+    assert not is_alive(shell_pid)
+    assert not is_alive(background_pid)
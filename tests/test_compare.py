@@ -0,0 +1,151 @@
+import asyncio
+import threading
+from src.main import ThemePreviewApp
+from src.sandbox.manager import SandboxManager
+
+THEMES = ["alpha", "beta", "gamma", "delta"]
+
+
+class StubEngine:
+    """Blocking preview engine whose renders the test releases explicitly."""
+
+    def __init__(self, block=True):
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def generate_preview(self, theme_name):
+        with self.lock:
+            self.calls.append(theme_name)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            self.release.wait(timeout=5)
+            return f"\x1b[32m{theme_name}>\x1b[0m"
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def make_app(tmp_path, compare_engine):
+    app = ThemePreviewApp()
+    app.discovery.scan_themes = lambda: list(THEMES)
+    app.sandbox = SandboxManager(str(tmp_path / "main"))
+    app.compare_sandboxes = [
+        SandboxManager(str(tmp_path / f"compare-{i}")) for i in range(app.COMPARE_WORKERS)
+    ]
+    app.preview_engine = StubEngine(block=False)
+    # Every compare slot shares one stub so the test sees overall concurrency
+    app.engine_class = lambda sandbox, discovery: compare_engine
+    app.warnings = []
+    notify = app.notify
+
+    def record_notify(message, *args, **kwargs):
+        if kwargs.get("severity") == "warning":
+            app.warnings.append(message)
+        return notify(message, *args, **kwargs)
+
+    app.notify = record_notify
+    return app
+
+
+async def wait_until(predicate, timeout=5):
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+async def pin_first(pilot, count):
+    """Pins the first `count` themes, moving down the list between pins."""
+    pilot.app.query_one("#theme_list").index = 0
+    await pilot.pause()
+    for i in range(count):
+        if i:
+            await pilot.press("j")
+        await pilot.press("p")
+
+
+def test_pin_limit_warns(tmp_path):
+    engine = StubEngine(block=False)
+    app = make_app(tmp_path, engine)
+
+    async def run():
+        async with app.run_test() as pilot:
+            await pin_first(pilot, app.MAX_PINNED + 1)
+            await pilot.pause()
+            assert app.pinned == THEMES[:app.MAX_PINNED]
+            assert len(app.warnings) == 1
+            await app.workers.wait_for_complete()
+
+    asyncio.run(run())
+
+
+def test_unpin_during_render_discards_result(tmp_path):
+    engine = StubEngine()
+    app = make_app(tmp_path, engine)
+
+    async def run():
+        async with app.run_test() as pilot:
+            try:
+                await pin_first(pilot, 1)
+                await wait_until(lambda: engine.active == 1)
+                await pilot.press("p")
+                assert app.pinned == []
+            finally:
+                engine.release.set()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            assert app.compare_cache == {}
+            assert app.compare_columns == {}
+
+    asyncio.run(run())
+
+
+def test_concurrency_bounded_by_compare_workers(tmp_path):
+    engine = StubEngine()
+    app = make_app(tmp_path, engine)
+
+    async def run():
+        async with app.run_test() as pilot:
+            try:
+                await pin_first(pilot, 3)
+                await wait_until(lambda: engine.active == app.COMPARE_WORKERS)
+                await asyncio.sleep(0.1)
+                assert engine.active == app.COMPARE_WORKERS
+            finally:
+                engine.release.set()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            assert engine.max_active == app.COMPARE_WORKERS
+            assert sorted(app.compare_cache) == sorted(THEMES[:3])
+
+    asyncio.run(run())
+
+
+def test_cursor_moves_do_not_rerender_pinned(tmp_path):
+    engine = StubEngine(block=False)
+    app = make_app(tmp_path, engine)
+
+    async def run():
+        async with app.run_test() as pilot:
+            await pin_first(pilot, 2)
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            column = app.compare_columns["alpha"]
+
+            for key in ["j", "j", "k", "k", "j"]:
+                await pilot.press(key)
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+
+            assert sorted(engine.calls) == ["alpha", "beta"]
+            assert app.compare_columns["alpha"] is column
+            assert "alpha>" in str(column.render())
+
+    asyncio.run(run())
@@ -0,0 +1,14 @@
+from src.themes.discovery import ThemeDiscovery
+
+
+def test_custom_theme_overrides_stock(tmp_path, monkeypatch):
+    omz = tmp_path / "omz"
+    (omz / "themes").mkdir(parents=True)
+    (omz / "custom/themes").mkdir(parents=True)
+    (omz / "themes/demo.zsh-theme").write_text("PROMPT='stock> '")
+    (omz / "custom/themes/demo.zsh-theme").write_text("PROMPT='custom> '")
+    monkeypatch.setenv("ZSH", str(omz))
+
+    discovery = ThemeDiscovery(cache_dir=str(tmp_path / "cache"))
+    assert discovery.find_local_theme("demo") == omz / "custom/themes/demo.zsh-theme"
+    assert discovery.get_theme_path("demo") == omz / "custom/themes/demo.zsh-theme"
@@ -0,0 +1,160 @@
+import json
+from src.gallery.builder import GalleryBuilder
+
+
+class FakeDiscovery:
+    """Serves theme files from a temp dir instead of OMZ/GitHub."""
+
+    def __init__(self, themes_dir):
+        self.themes_dir = themes_dir
+        self.omz_path = themes_dir
+
+    def scan_themes(self):
+        return sorted(p.stem for p in self.themes_dir.glob("*.zsh-theme"))
+
+    def get_theme_path(self, theme_name):
+        path = self.themes_dir / f"{theme_name}.zsh-theme"
+        return path if path.exists() else None
+
+
+def make_builder(tmp_path, themes, revision="rev1"):
+    themes_dir = tmp_path / "src_themes"
+    themes_dir.mkdir(exist_ok=True)
+    for name in themes:
+        (themes_dir / f"{name}.zsh-theme").write_text(f"PROMPT='{name}> '")
+
+    builder = GalleryBuilder(FakeDiscovery(themes_dir), output_dir=str(tmp_path / "gallery"),
+                             workers=2, sandbox_root=str(tmp_path / "sandbox"))
+    builder.revision = revision
+    builder.rendered = []
+    builder.get_omz_revision = lambda: builder.revision
+
+    def fake_render(theme_name):
+        builder.rendered.append(theme_name)
+        for suffix in (".svg", ".html"):
+            (builder.themes_dir / f"{theme_name}{suffix}").write_text(theme_name)
+
+    builder._render_theme = fake_render
+    return builder, themes_dir
+
+
+def manifest_themes(builder):
+    return json.loads(builder.manifest_path.read_text())["themes"]
+
+
+def test_skips_unchanged_themes(tmp_path):
+    builder, _ = make_builder(tmp_path, ["a", "b"])
+    assert sorted(builder.build()["rendered"]) == ["a", "b"]
+
+    builder.rendered = []
+    result = builder.build()
+    assert builder.rendered == []
+    assert sorted(result["skipped"]) == ["a", "b"]
+
+
+def test_rerenders_on_hash_change(tmp_path):
+    builder, themes_dir = make_builder(tmp_path, ["a", "b"])
+    builder.build()
+
+    (themes_dir / "a.zsh-theme").write_text("PROMPT='changed> '")
+    builder.rendered = []
+    result = builder.build()
+    assert builder.rendered == ["a"]
+    assert result["skipped"] == ["b"]
+
+
+def test_rerenders_on_revision_change(tmp_path):
+    builder, _ = make_builder(tmp_path, ["a", "b"])
+    builder.build()
+
+    builder.revision = "rev2"
+    builder.rendered = []
+    builder.build()
+    assert sorted(builder.rendered) == ["a", "b"]
+    assert manifest_themes(builder)["a"]["omz_revision"] == "rev2"
+
+
+def test_force_rerenders_everything(tmp_path):
+    builder, _ = make_builder(tmp_path, ["a", "b"])
+    builder.build()
+
+    builder.rendered = []
+    builder.build(force=True)
+    assert sorted(builder.rendered) == ["a", "b"]
+
+
+def test_subset_build_keeps_other_entries(tmp_path):
+    builder, themes_dir = make_builder(tmp_path, ["a", "b"])
+    builder.build()
+
+    (themes_dir / "a.zsh-theme").write_text("PROMPT='changed> '")
+    builder.rendered = []
+    builder.build(themes=["a"])
+    assert builder.rendered == ["a"]
+    assert sorted(manifest_themes(builder)) == ["a", "b"]
+
+
+def test_prunes_removed_themes(tmp_path):
+    builder, themes_dir = make_builder(tmp_path, ["a", "b", "c"])
+    builder.build()
+
+    (themes_dir / "c.zsh-theme").unlink()
+    builder.build()
+    assert sorted(manifest_themes(builder)) == ["a", "b"]
+    assert not (builder.themes_dir / "c.svg").exists()
+    assert not (builder.themes_dir / "c.html").exists()
+    assert "c.svg" not in (builder.output_dir / "index.html").read_text()
+
+
+def test_missing_theme_drops_entry_and_output(tmp_path):
+    builder, themes_dir = make_builder(tmp_path, ["a", "b"])
+    builder.build()
+
+    (themes_dir / "b.zsh-theme").unlink()
+    result = builder.build(themes=["a", "b"])
+    assert result["failed"] == ["b"]
+    assert sorted(manifest_themes(builder)) == ["a"]
+    assert not (builder.themes_dir / "b.svg").exists()
+
+
+def test_render_exports_svg_and_html(tmp_path):
+    builder, _ = make_builder(tmp_path, ["a"])
+    del builder._render_theme  # use the real exporter with a stub engine
+
+    class StubEngine:
+        def generate_preview(self, theme_name):
+            return "\x1b[32muser@host\x1b[0m ~ %"
+
+    builder._get_engine = lambda: StubEngine()
+    builder.themes_dir.mkdir(parents=True)
+    builder._render_theme("a")
+    assert "user@host" in (builder.themes_dir / "a.svg").read_text().replace("&#160;", " ")
+    assert "user@host" in (builder.themes_dir / "a.html").read_text()
+
+
+def test_render_failure_keeps_previous_output(tmp_path):
+    builder, themes_dir = make_builder(tmp_path, ["a", "b"])
+    builder.build()
+    previous = manifest_themes(builder)["a"]
+
+    (themes_dir / "a.zsh-theme").write_text("PROMPT='changed> '")
+    render = builder._render_theme
+
+    def flaky_render(theme_name):
+        if theme_name == "a":
+            raise RuntimeError("Error: timeout")
+        render(theme_name)
+
+    builder._render_theme = flaky_render
+    result = builder.build()
+    assert result["failed"] == ["a"]
+    assert manifest_themes(builder)["a"] == previous
+    assert (builder.themes_dir / "a.svg").exists()
+    assert (builder.themes_dir / "a.html").exists()
+    assert "themes/a.svg" in (builder.output_dir / "index.html").read_text()
+
+    # The stale entry no longer matches the new hash, so the next build retries
+    builder._render_theme = render
+    builder.rendered = []
+    builder.build()
+    assert builder.rendered == ["a"]
@@ -0,0 +1,25 @@
+from src.sandbox.manager import SandboxManager
+
+
+def test_theme_copy_tracks_source_changes(tmp_path):
+    sandbox = SandboxManager(str(tmp_path / "sandbox"))
+    theme = tmp_path / "demo.zsh-theme"
+    theme.write_text("PROMPT='old> '")
+
+    sandbox.create_zshrc("demo", theme_path=theme)
+    theme.write_text("PROMPT='new> '")
+    sandbox.create_zshrc("demo", theme_path=theme)
+
+    assert (sandbox.custom_themes_path / "demo.zsh-theme").read_text() == "PROMPT='new> '"
+    assert f'ZSH_CUSTOM="{sandbox.custom_path}"' in sandbox.zshrc_path.read_text()
+
+
+def test_zshrc_written_to_zdotdir(tmp_path):
+    sandbox = SandboxManager(str(tmp_path / "sandbox"))
+    session_dir = tmp_path / "session"
+    session_dir.mkdir()
+
+    sandbox.create_zshrc("demo", zdotdir=session_dir)
+
+    assert 'ZSH_THEME="demo"' in (session_dir / ".zshrc").read_text()
+    assert not sandbox.zshrc_path.exists()